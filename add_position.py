@@ -2,19 +2,24 @@
 """
 Add Position Script for Mid-Cap Experiment
 Usage: python add_position.py --symbol TICKER --shares 100 --price 25.50 --catalyst "Earnings beat"
+       python add_position.py --csv positions.csv [--strict]
 """
 
+import csv
+import copy
 import json
+import math
 import argparse
 from datetime import datetime
 import os
 
 def load_portfolio_state():
     """Load current portfolio state"""
-    if os.path.exists('state/portfolio_state.json'):
-        with open('state/portfolio_state.json', 'r') as f:
-            return json.load(f)
-    else:
+    try:
+        # One read of the whole file, then parse from memory
+        with open('state/portfolio_state.json', 'rb') as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
         return {
             "positions": {},
             "cash": 1000.00,
@@ -22,15 +27,85 @@ def load_portfolio_state():
             "last_update": None
         }
 
+# Set once the state directory is known to exist, so repeated saves skip makedirs
+_state_dir_ready = False
+
 def save_portfolio_state(state):
-    """Save portfolio state"""
-    os.makedirs('state', exist_ok=True)
-    with open('state/portfolio_state.json', 'w') as f:
+    """Save portfolio state
+
+    Written to a temp file and renamed over the target so a crash mid-write
+    never leaves a truncated state file. No fsync: the state is committed to
+    git after each run, so the page cache flush is durable enough here.
+    """
+    global _state_dir_ready
+    if not _state_dir_ready:
+        os.makedirs('state', exist_ok=True)
+        _state_dir_ready = True
+    
+    tmp_path = 'state/portfolio_state.json.tmp'
+    with open(tmp_path, 'w') as f:
         json.dump(state, f, indent=2, default=str)
+    os.replace(tmp_path, 'state/portfolio_state.json')
 
-def add_position(symbol, shares, price, catalyst="", sector=""):
-    """Add a new position to the portfolio"""
-    state = load_portfolio_state()
+def recompute_portfolio_value(state):
+    """Recompute portfolio value from cash and every position's market value"""
+    state['portfolio_value'] = state['cash'] + sum(pos['market_value'] for pos in state['positions'].values())
+    return state['portfolio_value']
+
+class PortfolioSession:
+    """Load portfolio state once, mutate it in memory, save it once on exit
+    
+    Callers set dirty once the state has actually changed; an untouched or
+    rejected session leaves the file as it was.
+    """
+    
+    def __enter__(self):
+        self.state = load_portfolio_state()
+        self.dirty = False
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Only persist a clean run; a failure mid-batch leaves the file untouched
+        if exc_type is None and self.dirty:
+            save_portfolio_state(self.state)
+        return False
+
+def validate_position_inputs(symbol, shares, price):
+    """Return an error message for an empty symbol or invalid share count or price, else None"""
+    if not symbol or not symbol.strip():
+        return "Symbol must not be empty"
+    # nan compares False against everything, so check finiteness before the sign
+    if not math.isfinite(shares) or shares <= 0:
+        return "Shares must be positive"
+    if not math.isfinite(price) or price <= 0:
+        return "Price must be positive"
+    return None
+
+def format_position_added(symbol, state):
+    """Return the report lines for a just-added position, with cash as it stands now"""
+    pos = state['positions'][symbol]
+    return [
+        f"✅ Added position: {symbol}",
+        f"   Shares: {pos['shares']}",
+        f"   Entry Price: ${pos['entry_price']:.2f}",
+        f"   Cost: ${pos['cost_basis']:.2f}",
+        f"   Initial Stop: ${pos['stop_level']:.2f}",
+        f"   Catalyst: {pos['catalyst']}",
+        f"   Remaining Cash: ${state['cash']:.2f}",
+        f"   Portfolio Value: ${state['portfolio_value']:.2f}"
+    ]
+
+def add_position(symbol, shares, price, catalyst="", sector="", state=None, timestamp=None, quiet=False):
+    """Add a new position to the portfolio
+    
+    If state is given, it is updated in place and saving is left to the caller
+    (see PortfolioSession); otherwise state is loaded and saved here.
+    timestamp lets batch callers stamp every position with one clock read.
+    quiet skips the success report (failures are still printed).
+    """
+    owns_state = state is None
+    if owns_state:
+        state = load_portfolio_state()
     
     # Calculate cost
     cost = shares * price
@@ -47,13 +122,14 @@ def add_position(symbol, shares, price, catalyst="", sector=""):
     
     # Calculate initial stop loss (13% below entry)
     initial_stop = price * 0.87
+    now_iso = timestamp or datetime.now().isoformat()
     
     # Add position
     state['positions'][symbol] = {
         'symbol': symbol,
         'shares': shares,
         'entry_price': price,
-        'entry_date': datetime.now().isoformat(),
+        'entry_date': now_iso,
         'cost_basis': cost,
         'catalyst': catalyst,
         'sector': sector,
@@ -66,48 +142,120 @@ def add_position(symbol, shares, price, catalyst="", sector=""):
         'stop_type': 'initial'
     }
     
-    # Update cash and portfolio value
+    # Update cash; portfolio value is unchanged since cash moved into a
+    # position valued at cost, so only rebuild it if it was never set
     state['cash'] -= cost
-    state['portfolio_value'] = state['cash'] + sum(pos['market_value'] for pos in state['positions'].values())
-    state['last_update'] = datetime.now().isoformat()
+    if state.get('portfolio_value') is None:
+        recompute_portfolio_value(state)
+    state['last_update'] = now_iso
     
     # Save state
-    save_portfolio_state(state)
+    if owns_state:
+        save_portfolio_state(state)
     
-    print(f"✅ Added position: {symbol}")
-    print(f"   Shares: {shares}")
-    print(f"   Entry Price: ${price:.2f}")
-    print(f"   Cost: ${cost:.2f}")
-    print(f"   Initial Stop: ${initial_stop:.2f}")
-    print(f"   Catalyst: {catalyst}")
-    print(f"   Remaining Cash: ${state['cash']:.2f}")
-    print(f"   Portfolio Value: ${state['portfolio_value']:.2f}")
+    if not quiet:
+        print("\n".join(format_position_added(symbol, state)))
     
     return True
 
+def add_positions(rows, strict=False, state=None):
+    """Add several positions with a single load and save of portfolio state
+    
+    Each row is a dict with symbol, shares and price, plus optional catalyst
+    and sector (e.g. from csv.DictReader). Invalid rows are skipped, unless
+    strict is set, in which case any failure leaves the portfolio unchanged.
+    Returns one success flag per row. In strict mode the per-row reports are
+    held back and only printed once the whole batch is accepted.
+    """
+    owns_state = state is None
+    if owns_state:
+        state = load_portfolio_state()
+    
+    # Strict mode works on a copy so a failing row can roll back the whole batch
+    working = copy.deepcopy(state) if strict else state
+    now_iso = datetime.now().isoformat()
+    results = []
+    reports = []
+    
+    for row in rows:
+        try:
+            symbol = row['symbol'].strip().upper()
+            shares = int(row['shares'])
+            price = float(row['price'])
+        except (KeyError, AttributeError, TypeError, ValueError) as e:
+            print(f"❌ Invalid row {row}: {e}")
+            results.append(False)
+            continue
+        
+        error = validate_position_inputs(symbol, shares, price)
+        if error:
+            print(f"❌ {symbol or row}: {error}")
+            results.append(False)
+            continue
+        
+        added = add_position(
+            symbol,
+            shares,
+            price,
+            row.get('catalyst') or '',
+            row.get('sector') or '',
+            state=working,
+            timestamp=now_iso,
+            quiet=strict
+        )
+        if added and strict:
+            reports.extend(format_position_added(symbol, working))
+        results.append(added)
+    
+    if strict:
+        if not all(results):
+            print("❌ Strict mode: batch rejected, no positions added")
+            return [False] * len(results)
+        state.clear()
+        state.update(working)
+        if reports:
+            print("\n".join(reports))
+    
+    if owns_state and any(results):
+        save_portfolio_state(state)
+    
+    return results
+
+def load_position_rows(path):
+    """Read position rows (symbol, shares, price, catalyst, sector) from a CSV file"""
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
 def show_portfolio():
     """Display current portfolio"""
     state = load_portfolio_state()
     
-    print(f"\n📊 CURRENT PORTFOLIO")
-    print(f"Cash: ${state['cash']:.2f}")
-    print(f"Portfolio Value: ${state['portfolio_value']:.2f}")
-    print(f"Positions: {len(state['positions'])}")
+    # Build the whole report first and print it with a single write
+    lines = [
+        f"\n📊 CURRENT PORTFOLIO",
+        f"Cash: ${state['cash']:.2f}",
+        f"Portfolio Value: ${state['portfolio_value']:.2f}",
+        f"Positions: {len(state['positions'])}"
+    ]
     
     if state['positions']:
-        print(f"\n📈 POSITIONS:")
+        lines.append(f"\n📈 POSITIONS:")
         for symbol, pos in state['positions'].items():
-            print(f"  {symbol}: {pos['shares']} shares @ ${pos['entry_price']:.2f}")
-            print(f"    Stop: ${pos['stop_level']:.2f} | Catalyst: {pos['catalyst']}")
+            lines.append(f"  {symbol}: {pos['shares']} shares @ ${pos['entry_price']:.2f}")
+            lines.append(f"    Stop: ${pos['stop_level']:.2f} | Catalyst: {pos['catalyst']}")
+    
+    print("\n".join(lines))
 
 def main():
     parser = argparse.ArgumentParser(description='Add position to mid-cap portfolio')
-    parser.add_argument('--symbol', required=True, help='Stock symbol (e.g., CRNX)')
-    parser.add_argument('--shares', type=int, required=True, help='Number of shares')
-    parser.add_argument('--price', type=float, required=True, help='Entry price per share')
+    parser.add_argument('--symbol', help='Stock symbol (e.g., CRNX)')
+    parser.add_argument('--shares', type=int, help='Number of shares')
+    parser.add_argument('--price', type=float, help='Entry price per share')
     parser.add_argument('--catalyst', default='', help='Investment catalyst')
     parser.add_argument('--sector', default='', help='Sector classification')
     parser.add_argument('--show', action='store_true', help='Show current portfolio')
+    parser.add_argument('--csv', help='Add every position in a CSV file (symbol,shares,price,catalyst,sector)')
+    parser.add_argument('--strict', action='store_true', help='With --csv, add nothing if any row fails')
     
     args = parser.parse_args()
     
@@ -116,23 +264,36 @@ def main():
         show_portfolio()
         return
     
-    # Validate inputs
-    if args.shares <= 0:
-        print("❌ Shares must be positive")
-        return
+    # Add every position from a CSV file in one batch
+    if args.csv:
+        rows = load_position_rows(args.csv)
+        with PortfolioSession() as session:
+            results = add_positions(rows, strict=args.strict, state=session.state)
+            session.dirty = any(results)
         
-    if args.price <= 0:
-        print("❌ Price must be positive")
-        return
-    
-    # Add position
-    success = add_position(
-        args.symbol.upper(),
-        args.shares,
-        args.price,
-        args.catalyst,
-        args.sector
-    )
+        print(f"\n📋 Added {sum(results)} of {len(results)} positions")
+        success = any(results)
+    else:
+        if args.symbol is None or args.shares is None or args.price is None:
+            parser.error("--symbol, --shares and --price are required unless --show or --csv is given")
+        
+        # Validate inputs
+        error = validate_position_inputs(args.symbol, args.shares, args.price)
+        if error:
+            print(f"❌ {error}")
+            return
+        
+        # Add position
+        with PortfolioSession() as session:
+            success = add_position(
+                args.symbol.strip().upper(),
+                args.shares,
+                args.price,
+                args.catalyst,
+                args.sector,
+                state=session.state
+            )
+            session.dirty = success
     
     if success:
         print(f"\n🎯 Next steps:")
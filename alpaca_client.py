@@ -1,61 +1,352 @@
 #!/usr/bin/env python3
 import os
+import sys
 import json
+import time
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
-from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import MarketOrderRequest, StopOrderRequest
-from alpaca.trading.enums import OrderSide, TimeInForce
+from file_cache import FileCache
+from rate_limit import RateLimiter
 
-def load_config():
-    """Load configuration from config.json"""
-    with open('config.json', 'r') as f:
+# alpaca-py (and the pandas stack its data package pulls in) is imported
+# inside the functions that need it, so importing this module stays cheap
+
+CONFIG_PATH = 'config.json'
+
+@lru_cache(maxsize=1)
+def _load_config_at(mtime):
+    """Parse config.json; cached per modification time so edits are picked up"""
+    with open(CONFIG_PATH, 'r') as f:
         return json.load(f)
 
-def get_alpaca_client():
-    """Initialize Alpaca client"""
+def load_config():
+    """Load configuration from config.json (re-parsed only when the file changes; treat as read-only)"""
+    return _load_config_at(os.path.getmtime(CONFIG_PATH))
+
+def get_alpaca_credentials():
+    """Read Alpaca API credentials from the environment"""
     api_key = os.environ.get('ALPACA_API_KEY')
     secret_key = os.environ.get('ALPACA_SECRET_KEY')
-    base_url = os.environ.get('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets')
     
     if not api_key or not secret_key:
         raise ValueError("Alpaca API credentials not found in environment variables")
     
-    return TradingClient(api_key, secret_key, paper=True)
+    return api_key, secret_key
+
+def _tune_http_session(client):
+    """Give an alpaca-py client's requests session a keep-alive connection pool
+    
+    urllib3 only retries idempotent methods here, so order POSTs are never
+    resent; alpaca-py still handles 429/504 retries itself.
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = getattr(client, "_session", None)
+    if session is None:
+        return client
+    
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return client
+
+@lru_cache(maxsize=1)
+def get_alpaca_client():
+    """Initialize Alpaca client
+    
+    Cached so every caller in the process shares one client and its
+    keep-alive HTTP session; use get_alpaca_client.cache_clear() to rebuild.
+    """
+    from alpaca.trading.client import TradingClient
+    
+    api_key, secret_key = get_alpaca_credentials()
+    return _tune_http_session(TradingClient(api_key, secret_key, paper=True))
+
+@lru_cache(maxsize=1)
+def get_data_client():
+    """Initialize Alpaca market data client (cached like get_alpaca_client)"""
+    from alpaca.data.historical import StockHistoricalDataClient
+    
+    api_key, secret_key = get_alpaca_credentials()
+    return _tune_http_session(StockHistoricalDataClient(api_key, secret_key))
+
+@lru_cache(maxsize=1)
+def get_http_session():
+    """Shared keep-alive session for non-Alpaca quote lookups (Alpha Vantage)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+    ))
+    return session
+
+# Account info barely changes between calls in one run; reuse it briefly
+ACCOUNT_CACHE_TTL = 5.0
+_account_cache = {"account": None, "fetched_at": 0.0}
+
+def get_account_cached(client, ttl=ACCOUNT_CACHE_TTL):
+    """Get account info, reusing a response fetched within the last ttl seconds"""
+    now = time.monotonic()
+    if _account_cache["account"] is not None and now - _account_cache["fetched_at"] < ttl:
+        return _account_cache["account"]
+    
+    account = client.get_account()
+    _account_cache["account"] = account
+    _account_cache["fetched_at"] = now
+    return account
 
-def sync_with_alpaca_positions():
+def invalidate_account_cache():
+    """Force the next get_account_cached call to refetch (e.g. after an order)"""
+    _account_cache["account"] = None
+    _account_cache["fetched_at"] = 0.0
+
+# Same idea for positions: sync, checks and order helpers all read them within seconds.
+# The list and its symbol index are stored as one tuple so concurrent order
+# threads never see one refreshed without the other.
+POSITIONS_CACHE_TTL = 5.0
+_positions_cache = {"snapshot": None, "fetched_at": 0.0}
+
+def _get_positions_snapshot(client, ttl):
+    """Return (positions, positions_by_symbol), refetching once older than ttl seconds"""
+    now = time.monotonic()
+    snapshot = _positions_cache["snapshot"]
+    if snapshot is not None and now - _positions_cache["fetched_at"] < ttl:
+        return snapshot
+    
+    positions = client.get_all_positions()
+    snapshot = (positions, {pos.symbol: pos for pos in positions})
+    _positions_cache["snapshot"] = snapshot
+    _positions_cache["fetched_at"] = now
+    return snapshot
+
+def get_positions_cached(client, ttl=POSITIONS_CACHE_TTL):
+    """Get all open positions, reusing a response fetched within the last ttl seconds"""
+    return _get_positions_snapshot(client, ttl)[0]
+
+def get_position_cached(client, symbol, ttl=POSITIONS_CACHE_TTL):
+    """Get one open position by symbol (None if not held) from the cached positions"""
+    return _get_positions_snapshot(client, ttl)[1].get(symbol)
+
+def invalidate_positions_cache():
+    """Force the next get_positions_cached call to refetch (e.g. after an order)"""
+    _positions_cache["snapshot"] = None
+    _positions_cache["fetched_at"] = 0.0
+
+def get_account_and_positions(client):
+    """Fetch account info and open positions concurrently, each through its TTL cache"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        account_future = executor.submit(get_account_cached, client)
+        positions_future = executor.submit(get_positions_cached, client)
+        return account_future.result(), positions_future.result()
+
+# Position fields we report, as (our key, alpaca-py attribute); all numeric strings
+POSITION_FLOAT_FIELDS = (
+    ("shares", "qty"),
+    ("avg_entry_price", "avg_entry_price"),
+    ("market_value", "market_value"),
+    ("cost_basis", "cost_basis"),
+    ("unrealized_pnl", "unrealized_pl"),
+    ("unrealized_pnl_pct", "unrealized_plpc")
+)
+
+def position_price(pos):
+    """Current price Alpaca reports for a position, derived from market value if absent"""
+    if pos.current_price is not None:
+        return float(pos.current_price)
+    return float(pos.market_value) / float(pos.qty)
+
+def get_position_prices(positions):
+    """Prices for a {symbol: position} mapping, taken from the positions payload itself
+    
+    Alpaca already prices every open position, so no quote request is needed
+    for them; only symbols whose price can't be read from the payload go to
+    get_current_prices.
+    """
+    prices = {}
+    for symbol, pos in positions.items():
+        try:
+            prices[symbol] = position_price(pos)
+        except (TypeError, ValueError, ZeroDivisionError):
+            pass
+    
+    missing = [symbol for symbol in positions if not prices.get(symbol)]
+    prices.update(get_current_prices(missing))
+    return prices
+
+def position_to_dict(pos):
+    """Convert an alpaca-py position into a dict of floats in one pass"""
+    position = {key: float(getattr(pos, attr)) for key, attr in POSITION_FLOAT_FIELDS}
+    position["current_price"] = position_price(pos)
+    return position
+
+def clear_caches():
+    """Drop all in-memory caches (config, thresholds, clients, account, positions)
+    
+    Call after rotating credentials in a long-lived process; config.json edits
+    are picked up automatically.
+    """
+    _load_config_at.cache_clear()
+    _stock_thresholds_at.cache_clear()
+    get_alpaca_client.cache_clear()
+    get_data_client.cache_clear()
+    get_http_session.cache_clear()
+    invalidate_account_cache()
+    invalidate_positions_cache()
+
+# main.py, check_stops.py and trailing_stops.py run back to back in one workflow
+# job and ask for the same quotes; share them across processes for a short while
+def _price_cache_ttl(default=60.0):
+    """Seconds to reuse cached prices, from PRICE_CACHE_TTL; a malformed value falls back to the default"""
+    value = os.environ.get('PRICE_CACHE_TTL')
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        print(f"Ignoring invalid PRICE_CACHE_TTL={value!r}, using {default:g}s")
+        return default
+
+PRICE_CACHE_TTL = _price_cache_ttl()
+_price_cache = FileCache(os.path.join('.cache', 'prices'))
+
+def get_current_prices(symbols):
+    """Get current prices for several symbols in one latest-quotes request
+    
+    Uses the bid/ask midpoint; symbols without a two-sided quote fall back
+    to a single latest-trades request covering all of them. Prices fetched
+    within the last PRICE_CACHE_TTL seconds are reused from .cache/prices.
+    """
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    
+    prices = {}
+    for symbol in symbols:
+        cached = _price_cache.get(symbol, PRICE_CACHE_TTL)
+        if cached is not None:
+            prices[symbol] = cached
+    
+    to_fetch = [symbol for symbol in symbols if symbol not in prices]
+    if not to_fetch:
+        return prices
+    
+    from alpaca.data.requests import StockLatestQuoteRequest, StockLatestTradeRequest
+    
+    fetched = {}
+    try:
+        client = get_data_client()
+        quotes = client.get_stock_latest_quote(StockLatestQuoteRequest(symbol_or_symbols=to_fetch))
+        for symbol, quote in quotes.items():
+            bid, ask = float(quote.bid_price), float(quote.ask_price)
+            if bid > 0 and ask > 0:
+                fetched[symbol] = (bid + ask) / 2
+        
+        missing = [symbol for symbol in to_fetch if symbol not in fetched]
+        if missing:
+            trades = client.get_stock_latest_trade(StockLatestTradeRequest(symbol_or_symbols=missing))
+            for symbol, trade in trades.items():
+                fetched[symbol] = float(trade.price)
+    except Exception as e:
+        print(f"Error fetching Alpaca prices for {to_fetch}: {e}")
+    
+    cache_prices(fetched)
+    prices.update(fetched)
+    return prices
+
+def invalidate_price_cache(symbol):
+    """Force the next get_current_prices call to refetch symbol (e.g. after an order fills)"""
+    _price_cache.delete(symbol)
+
+def cache_prices(prices):
+    """Store prices (e.g. from a fallback source) so the next get_current_prices call reuses them"""
+    for symbol, price in prices.items():
+        if price:
+            _price_cache.set(symbol, price)
+
+# Alpha Vantage free tier allows 5 calls a minute; past that get_current_price goes straight to
+# yfinance. Call times live in .cache so the back-to-back daily scripts share the budget
+_alpha_vantage_limiter = RateLimiter(calls=5, period=60, path=os.path.join('.cache', 'alpha_vantage_calls.json'))
+
+def get_current_price(symbol):
+    """Get one symbol's price from Alpha Vantage (while the shared budget allows) or yfinance"""
+    alpha_vantage_key = os.environ.get('ALPHA_VANTAGE_API_KEY')
+    
+    if alpha_vantage_key and _alpha_vantage_limiter.try_acquire():
+        try:
+            url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={alpha_vantage_key}"
+            response = get_http_session().get(url, timeout=10)
+            data = response.json()
+            
+            if "Global Quote" in data:
+                return float(data["Global Quote"]["05. price"])
+        except Exception as e:
+            print(f"Alpha Vantage failed for {symbol}: {e}")
+    
+    # Fallback to Yahoo Finance
+    try:
+        import yfinance as yf
+        ticker = yf.Ticker(symbol)
+        hist = ticker.history(period="1d")
+        if not hist.empty:
+            return float(hist['Close'].iloc[-1])
+    except Exception as e:
+        print(f"YFinance failed for {symbol}: {e}")
+    
+    return None
+
+def fill_missing_prices(prices, symbols):
+    """Look up prices the bulk Alpaca request missed, overlapping the per-symbol fallbacks"""
+    missing = [symbol for symbol in symbols if not prices.get(symbol)]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as executor:
+            fallback = dict(zip(missing, executor.map(get_current_price, missing)))
+        # Share fallback prices with the scripts that run next, so they don't
+        # spend another Alpha Vantage call (5/minute) on the same symbol
+        cache_prices(fallback)
+        prices.update(fallback)
+    return prices
+
+def sync_with_alpaca_positions(config=None, client=None):
     """Sync portfolio with current Alpaca positions"""
-    config = load_config()
-    client = get_alpaca_client()
+    config = config or load_config()
+    client = client or get_alpaca_client()
     
     print("=== Syncing with Alpaca Positions ===")
     
     try:
-        # Get account info
-        account = client.get_account()
+        # Get account info and current positions (independent endpoints, fetched together)
+        account, positions = get_account_and_positions(client)
         print(f"Account Status: {account.status}")
         print(f"Cash: ${float(account.cash):,.2f}")
         
-        # Get current positions
-        positions = client.get_all_positions()
         alpaca_symbols = [pos.symbol for pos in positions if pos.symbol in config["stocks"]]
         
         print(f"Current Alpaca positions: {alpaca_symbols}")
         print(f"Expected positions: {list(config['stocks'].keys())}")
         
-        # Check for missing positions (potential stop losses)
-        expected_symbols = set(config["stocks"].keys())
-        current_symbols = set(alpaca_symbols)
-        missing_positions = expected_symbols - current_symbols
+        # Check for missing positions (potential stop losses); the config's keys
+        # view is already set-like, so it is diffed directly without a copy
+        missing_positions = config["stocks"].keys() - set(alpaca_symbols)
         
         if missing_positions:
             print(f"Missing positions (potential stop losses): {missing_positions}")
             
             # Log stop loss events
+            detected_at = datetime.now().isoformat()
             stop_loss_data = []
             for symbol in missing_positions:
                 stop_loss_data.append({
                     "symbol": symbol,
-                    "detected_at": datetime.now().isoformat(),
+                    "detected_at": detected_at,
                     "reason": "Position missing from Alpaca account"
                 })
             
@@ -71,14 +362,7 @@ def sync_with_alpaca_positions():
         position_data = {}
         for pos in positions:
             if pos.symbol in config["stocks"]:
-                position_data[pos.symbol] = {
-                    "shares": float(pos.qty),
-                    "avg_entry_price": float(pos.avg_entry_price),
-                    "market_value": float(pos.market_value),
-                    "cost_basis": float(pos.cost_basis),
-                    "unrealized_pnl": float(pos.unrealized_pl),
-                    "unrealized_pnl_pct": float(pos.unrealized_plpc)
-                }
+                position_data[pos.symbol] = position_to_dict(pos)
         
         return {
             "status": "positions_synced",
@@ -96,6 +380,9 @@ def sync_with_alpaca_positions():
 
 def execute_stop_loss(symbol, reason="Manual trigger"):
     """Execute stop loss for a specific symbol"""
+    from alpaca.trading.requests import MarketOrderRequest
+    from alpaca.trading.enums import OrderSide, TimeInForce
+    
     config = load_config()
     client = get_alpaca_client()
     
@@ -104,15 +391,14 @@ def execute_stop_loss(symbol, reason="Manual trigger"):
     
     try:
         # Get current position
-        positions = client.get_all_positions()
-        position = next((pos for pos in positions if pos.symbol == symbol), None)
+        position = get_position_cached(client, symbol)
         
         if not position:
             print(f"No position found for {symbol}")
             return {"status": "no_position", "symbol": symbol}
         
         shares = float(position.qty)
-        current_price = float(position.market_value) / shares
+        current_price = position_price(position)
         
         print(f"Current position: {shares} shares @ ${current_price:.2f}")
         
@@ -125,6 +411,9 @@ def execute_stop_loss(symbol, reason="Manual trigger"):
         )
         
         order = client.submit_order(order_request)
+        invalidate_account_cache()
+        invalidate_positions_cache()
+        invalidate_price_cache(symbol)
         
         print(f"Stop loss order submitted: {order.id}")
         
@@ -149,6 +438,9 @@ def execute_stop_loss(symbol, reason="Manual trigger"):
 
 def execute_profit_target(symbol, percentage=0.5):
     """Execute partial profit taking at target level"""
+    from alpaca.trading.requests import MarketOrderRequest
+    from alpaca.trading.enums import OrderSide, TimeInForce
+    
     config = load_config()
     client = get_alpaca_client()
     
@@ -157,8 +449,7 @@ def execute_profit_target(symbol, percentage=0.5):
     
     try:
         # Get current position
-        positions = client.get_all_positions()
-        position = next((pos for pos in positions if pos.symbol == symbol), None)
+        position = get_position_cached(client, symbol)
         
         if not position:
             print(f"No position found for {symbol}")
@@ -166,7 +457,7 @@ def execute_profit_target(symbol, percentage=0.5):
         
         total_shares = float(position.qty)
         sell_shares = total_shares * percentage
-        current_price = float(position.market_value) / total_shares
+        current_price = position_price(position)
         
         print(f"Selling {sell_shares:.3f} of {total_shares} shares @ ~${current_price:.2f}")
         
@@ -179,6 +470,9 @@ def execute_profit_target(symbol, percentage=0.5):
         )
         
         order = client.submit_order(order_request)
+        invalidate_account_cache()
+        invalidate_positions_cache()
+        invalidate_price_cache(symbol)
         
         print(f"Profit target order submitted: {order.id}")
         
@@ -207,8 +501,7 @@ def get_account_summary():
     client = get_alpaca_client()
     
     try:
-        account = client.get_account()
-        positions = client.get_all_positions()
+        account, positions = get_account_and_positions(client)
         
         # Filter positions to only our stocks
         config = load_config()
@@ -224,29 +517,47 @@ def get_account_summary():
         }
         
         for pos in our_positions:
-            summary["positions"][pos.symbol] = {
-                "shares": float(pos.qty),
-                "avg_entry_price": float(pos.avg_entry_price),
-                "current_price": float(pos.market_value) / float(pos.qty),
-                "market_value": float(pos.market_value),
-                "cost_basis": float(pos.cost_basis),
-                "unrealized_pnl": float(pos.unrealized_pl),
-                "unrealized_pnl_pct": float(pos.unrealized_plpc)
-            }
+            summary["positions"][pos.symbol] = position_to_dict(pos)
         
         return summary
         
     except Exception as e:
         return {"error": str(e)}
 
+# Per-symbol price levels from config.json, flattened once so per-price checks
+# (every monitoring pass, every streamed trade) skip the nested dict lookups
+StockThresholds = namedtuple("StockThresholds", ["entry_target", "stop_loss", "target_1", "target_2"])
+
+@lru_cache(maxsize=1)
+def _stock_thresholds_at(mtime):
+    """Build the thresholds table for the config.json version with this modification time"""
+    return {
+        symbol: StockThresholds(stock["entry_target"], stock["stop_loss"], stock["target_1"], stock["target_2"])
+        for symbol, stock in load_config()["stocks"].items()
+    }
+
+def get_stock_thresholds():
+    """Map each configured symbol to its StockThresholds (rebuilt only when config.json changes)"""
+    return _stock_thresholds_at(os.path.getmtime(CONFIG_PATH))
+
+def dynamic_stop_level(thresholds, current_price, trailing_stop_trigger):
+    """Stop level for a position: fixed stop, raised to an 8% trail once gains pass the trigger"""
+    gain_pct = (current_price - thresholds.entry_target) / thresholds.entry_target
+    
+    if gain_pct > trailing_stop_trigger:
+        trailing_stop = current_price * 0.92  # 8% trailing
+        return max(thresholds.stop_loss, trailing_stop)
+    return thresholds.stop_loss
+
 def monitor_positions():
     """Monitor positions for stop loss and profit target triggers"""
     config = load_config()
+    client = get_alpaca_client()
     
     print("=== Monitoring Positions ===")
     
     # Sync with Alpaca
-    sync_result = sync_with_alpaca_positions()
+    sync_result = sync_with_alpaca_positions(config, client)
     
     if sync_result["status"] == "stop_losses_detected":
         print(f"Stop losses detected: {sync_result['missing_positions']}")
@@ -259,19 +570,15 @@ def monitor_positions():
     # Check for profit targets and stop losses
     alerts = []
     
+    thresholds_by_symbol = get_stock_thresholds()
+    trailing_stop_trigger = config["portfolio"]["trailing_stop_trigger"]
+    
     for symbol, position in sync_result["positions"].items():
-        stock_config = config["stocks"][symbol]
-        current_price = position["market_value"] / position["shares"]
+        thresholds = thresholds_by_symbol[symbol]
+        current_price = position["current_price"]
         
         # Check stop loss
-        gain_pct = (current_price - stock_config["entry_target"]) / stock_config["entry_target"]
-        
-        # Dynamic stop loss calculation
-        if gain_pct > config["portfolio"]["trailing_stop_trigger"]:
-            trailing_stop = current_price * 0.92  # 8% trailing
-            dynamic_stop = max(stock_config["stop_loss"], trailing_stop)
-        else:
-            dynamic_stop = stock_config["stop_loss"]
+        dynamic_stop = dynamic_stop_level(thresholds, current_price, trailing_stop_trigger)
         
         if current_price <= dynamic_stop:
             alerts.append({
@@ -283,21 +590,21 @@ def monitor_positions():
             })
         
         # Check profit targets
-        if current_price >= stock_config["target_1"]:
+        if current_price >= thresholds.target_1:
             alerts.append({
                 "type": "profit_target_1",
                 "symbol": symbol,
                 "current_price": current_price,
-                "target_price": stock_config["target_1"],
+                "target_price": thresholds.target_1,
                 "action_required": True
             })
         
-        if current_price >= stock_config["target_2"]:
+        if current_price >= thresholds.target_2:
             alerts.append({
                 "type": "profit_target_2",
                 "symbol": symbol,
                 "current_price": current_price,
-                "target_price": stock_config["target_2"],
+                "target_price": thresholds.target_2,
                 "action_required": True
             })
     
@@ -308,7 +615,72 @@ def monitor_positions():
         "cash": sync_result["cash"]
     }
 
+def stream_monitor_positions():
+    """Watch live trades over Alpaca's websocket and act on stop/target crossings
+    
+    Long-running alternative to polling monitor_positions(); the scheduled
+    workflow keeps polling. Per session, each symbol is stopped out at most
+    once and sells at target_1 and at target_2 at most once each
+    (execute_profit_target's default half of the shares still held). A tick
+    past both targets submits one sale and counts for both. Shares left after
+    a target sale stay covered by the stop, and an order that isn't submitted
+    re-arms its stop or target for the next tick.
+    """
+    from alpaca.data.live import StockDataStream
+    
+    config = load_config()
+    api_key, secret_key = get_alpaca_credentials()
+    stopped = set()
+    target_hit = {"target_1": set(), "target_2": set()}
+    
+    print(f"=== Streaming trades for {list(config['stocks'].keys())} ===")
+    
+    async def on_trade(trade):
+        symbol = trade.symbol
+        if symbol in stopped:
+            return
+        
+        # Re-read per tick (a stat when unchanged) so config.json edits apply without a restart
+        thresholds = get_stock_thresholds().get(symbol)
+        if thresholds is None:
+            return
+        trailing_stop_trigger = load_config()["portfolio"]["trailing_stop_trigger"]
+        
+        price = float(trade.price)
+        stop_level = dynamic_stop_level(thresholds, price, trailing_stop_trigger)
+        
+        # Orders are blocking REST calls; keep them off the stream's event loop.
+        # Symbols are marked before awaiting so a tick arriving mid-order can't repeat it.
+        if price <= stop_level:
+            stopped.add(symbol)
+            reason = f"Stream price ${price:.2f} <= Stop ${stop_level:.2f}"
+            result = await asyncio.to_thread(execute_stop_loss, symbol, reason)
+            if result.get("status") != "order_submitted":
+                stopped.discard(symbol)
+            return
+        
+        reached = [target for target in ("target_1", "target_2")
+                   if price >= getattr(thresholds, target) and symbol not in target_hit[target]]
+        if not reached:
+            return
+        
+        # One sale per tick: a second partial sell would compete for shares held by the first order
+        for target in reached:
+            target_hit[target].add(symbol)
+        result = await asyncio.to_thread(execute_profit_target, symbol)
+        if result.get("status") != "order_submitted":
+            for target in reached:
+                target_hit[target].discard(symbol)
+    
+    stream = StockDataStream(api_key, secret_key)
+    stream.subscribe_trades(on_trade, *config["stocks"].keys())
+    stream.run()
+
 if __name__ == "__main__":
+    if "--stream" in sys.argv:
+        stream_monitor_positions()
+        sys.exit(0)
+    
     # Run position monitoring
     result = monitor_positions()
     print(json.dumps(result, indent=2))
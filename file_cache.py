@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Small file-backed TTL cache for values that change at most once a day
+Each key is stored as a JSON file under .cache/; freshness is taken from the file's mtime.
+"""
+
+import os
+import re
+import json
+import time
+
+class FileCache:
+    """JSON values on disk, one file per key, expired after a caller-supplied TTL"""
+    
+    def __init__(self, directory='.cache'):
+        self.directory = directory
+    
+    def _path(self, key):
+        safe_key = re.sub(r'[^A-Za-z0-9_.-]', '_', key)
+        return os.path.join(self.directory, f"{safe_key}.json")
+    
+    def get(self, key, ttl_seconds):
+        """Return the cached value for key if younger than ttl_seconds, else None"""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) >= ttl_seconds:
+                return None
+            with open(path, 'rb') as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Cache read failed for {key}: {e}")
+            return None
+    
+    def set(self, key, value):
+        """Store value for key; failures are reported and otherwise ignored"""
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(value, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Cache write failed for {key}: {e}")
+    
+    def delete(self, key):
+        """Drop the cached value for key, if any"""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Cache delete failed for {key}: {e}")
@@ -1,49 +1,15 @@
 #!/usr/bin/env python3
 import json
-import requests
 from datetime import datetime
-from alpaca_client import get_alpaca_client, execute_stop_loss
+from alpaca_client import load_config, get_alpaca_client, get_account_cached, get_positions_cached, get_position_prices, fill_missing_prices, get_stock_thresholds, execute_stop_loss
 
-def load_config():
-    """Load configuration from config.json"""
-    with open('config.json', 'r') as f:
-        return json.load(f)
-
-def get_current_price(symbol):
-    """Get current stock price"""
-    import os
-    alpha_vantage_key = os.environ.get('ALPHA_VANTAGE_API_KEY')
-    
-    if alpha_vantage_key:
-        try:
-            url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={alpha_vantage_key}"
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            if "Global Quote" in data:
-                return float(data["Global Quote"]["05. price"])
-        except Exception as e:
-            print(f"Alpha Vantage failed for {symbol}: {e}")
-    
-    # Fallback to Yahoo Finance
-    try:
-        import yfinance as yf
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="1d")
-        if not hist.empty:
-            return float(hist['Close'].iloc[-1])
-    except Exception as e:
-        print(f"YFinance failed for {symbol}: {e}")
-    
-    return None
-
-def calculate_dynamic_stop_loss(symbol, current_price, config):
-    """Calculate dynamic stop loss including trailing stops"""
-    stock_config = config["stocks"][symbol]
+def calculate_dynamic_stop_loss(symbol, current_price, config, thresholds=None):
+    """Calculate dynamic stop loss including trailing stops (thresholds: the symbol's StockThresholds, looked up if omitted)"""
+    thresholds = thresholds or get_stock_thresholds()[symbol]
     portfolio_config = config["portfolio"]
     
-    entry_price = stock_config["entry_target"]
-    base_stop = stock_config["stop_loss"]
+    entry_price = thresholds.entry_target
+    base_stop = thresholds.stop_loss
     
     # Calculate gain percentage
     gain_pct = (current_price - entry_price) / entry_price
@@ -75,7 +41,7 @@ def check_all_stop_losses():
     
     # Get current Alpaca positions
     try:
-        alpaca_positions = client.get_all_positions()
+        alpaca_positions = get_positions_cached(client)
         current_positions = {pos.symbol: pos for pos in alpaca_positions if pos.symbol in config["stocks"]}
     except Exception as e:
         print(f"Error getting Alpaca positions: {e}")
@@ -83,6 +49,15 @@ def check_all_stop_losses():
     
     stop_loss_alerts = []
     
+    # Prices come with the positions payload already fetched above; a batched
+    # quote request and then per-symbol lookups (run concurrently) fill any gaps
+    prices = fill_missing_prices(get_position_prices(current_positions), current_positions.keys())
+    
+    # Every alert in this pass comes from the same price snapshot; stamp them once
+    checked_at = datetime.now().isoformat()
+    # Look thresholds up once for the pass rather than once per symbol
+    thresholds_by_symbol = get_stock_thresholds()
+    
     for symbol in config["stocks"].keys():
         # Check if position still exists
         if symbol not in current_positions:
@@ -90,13 +65,13 @@ def check_all_stop_losses():
             continue
         
         # Get current price
-        current_price = get_current_price(symbol)
+        current_price = prices.get(symbol)
         if not current_price:
             print(f"Could not get current price for {symbol}")
             continue
         
         # Calculate dynamic stop loss
-        stop_data = calculate_dynamic_stop_loss(symbol, current_price, config)
+        stop_data = calculate_dynamic_stop_loss(symbol, current_price, config, thresholds_by_symbol[symbol])
         
         print(f"{symbol}: ${current_price:.2f} | Stop: ${stop_data['stop_price']:.2f} ({stop_data['stop_type']}) | Gain: {stop_data['gain_pct']:.2%}")
         
@@ -112,14 +87,14 @@ def check_all_stop_losses():
                 "trigger_reason": f"Price ${current_price:.2f} <= Stop ${stop_data['stop_price']:.2f}",
                 "shares": float(current_positions[symbol].qty),
                 "estimated_proceeds": float(current_positions[symbol].qty) * current_price,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": checked_at
             })
     
     return {
         "status": "check_complete",
         "stop_loss_alerts": stop_loss_alerts,
         "positions_checked": len(current_positions),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": checked_at
     }
 
 def execute_triggered_stops():
@@ -165,7 +140,7 @@ def monitor_risk_levels():
     client = get_alpaca_client()
     
     try:
-        account = client.get_account()
+        account = get_account_cached(client)
         portfolio_value = float(account.equity)
         baseline_investment = config["portfolio"]["baseline_investment"]
         max_risk = config["portfolio"]["max_portfolio_risk"]
@@ -266,7 +241,9 @@ if __name__ == "__main__":
     else:
         print("\n✅ All systems normal - no action required")
     
-    # Save report to file
-    with open('data/stop_loss_report.json', 'w') as f:
-        json.dump(report, f, indent=2)
+    # Save report to file; encode in one pass and write once rather than
+    # letting json.dump stream many small chunks through the file object
+    payload = json.dumps(report, indent=2).encode('utf-8')
+    with open('data/stop_loss_report.json', 'wb') as f:
+        f.write(payload)
     print(f"\nReport saved to data/stop_loss_report.json")
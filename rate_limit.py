@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Thread-safe request budget for rate-limited APIs (e.g. Alpha Vantage free tier: 5 calls/minute)
+Callers ask for a slot and use a fallback source when none is free, rather than sleeping.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+
+class RateLimiter:
+    """Allow at most `calls` acquisitions in any sliding window of `period` seconds
+    
+    With a path, call times are kept in that JSON file so the budget is shared by
+    processes that run one after another (the daily scripts); without one it only
+    covers the current process. Concurrent processes are not coordinated.
+    """
+    
+    def __init__(self, calls, period, path=None):
+        self.calls = calls
+        self.period = period
+        self.path = path
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        """Read persisted call times; a missing or unreadable file counts as no calls"""
+        try:
+            with open(self.path, 'rb') as f:
+                return deque(json.loads(f.read()))
+        except FileNotFoundError:
+            return deque()
+        except (OSError, ValueError) as e:
+            print(f"Rate limit state read failed for {self.path}: {e}")
+            return deque()
+    
+    def _save(self, timestamps):
+        """Persist call times via a temp file; failures are reported and otherwise ignored"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(list(timestamps), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Rate limit state write failed for {self.path}: {e}")
+    
+    def try_acquire(self):
+        """Take a slot and return True if one is free, else return False without waiting"""
+        with self._lock:
+            # Wall-clock time when persisted: monotonic clocks don't compare across processes
+            if self.path:
+                now = time.time()
+                self._timestamps = self._load()
+            else:
+                now = time.monotonic()
+            
+            while self._timestamps and now - self._timestamps[0] >= self.period:
+                self._timestamps.popleft()
+            
+            if len(self._timestamps) >= self.calls:
+                return False
+            
+            self._timestamps.append(now)
+            if self.path:
+                self._save(self._timestamps)
+            return True
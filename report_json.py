@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+JSON encoding hook for report files
+Reports are built from pandas aggregates and dates; map those to native JSON types instead of strings.
+"""
+
+def json_default(obj):
+    """json.dumps default= hook: datetimes to ISO strings, numpy/pandas values to Python numbers and lists"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    # numpy scalars (np.int64 from max()/sum(), np.bool_, ...) and arrays/Series all
+    # convert to native values via tolist()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return str(obj)
@@ -13,6 +13,7 @@ import logging
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from report_json import json_default
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -35,10 +36,10 @@ class PortfolioReportGenerator:
         data = {}
         
         # Portfolio state
-        if os.path.exists(self.portfolio_state_file):
-            with open(self.portfolio_state_file, 'r') as f:
-                data['state'] = json.load(f)
-        else:
+        try:
+            with open(self.portfolio_state_file, 'rb') as f:
+                data['state'] = json.loads(f.read())
+        except FileNotFoundError:
             data['state'] = {}
         
         # Portfolio history
@@ -157,6 +158,7 @@ class PortfolioReportGenerator:
         """Analyze individual positions"""
         positions = data['state'].get('positions', {})
         analysis = {}
+        now = datetime.now()
         
         for symbol, position in positions.items():
             entry_price = position.get('entry_price', 0)
@@ -180,7 +182,7 @@ class PortfolioReportGenerator:
                     'stop_distance_pct': (current_price - stop_level) / current_price * 100 if stop_level > 0 else 0,
                     'catalyst': position.get('catalyst', ''),
                     'sector': position.get('sector', ''),
-                    'days_held': (datetime.now() - datetime.fromisoformat(position.get('entry_date', datetime.now().isoformat()))).days
+                    'days_held': (now - datetime.fromisoformat(position['entry_date'])).days if position.get('entry_date') else 0
                 }
         
         return analysis
@@ -277,8 +279,9 @@ class PortfolioReportGenerator:
             }
             
             # Save to docs for dashboard
-            with open('../docs/latest_report.json', 'w') as f:
-                json.dump(latest_data, f, indent=2, default=str)
+            payload = json.dumps(latest_data, indent=2, default=json_default).encode('utf-8')
+            with open('../docs/latest_report.json', 'wb') as f:
+                f.write(payload)
             
             logger.info("Updated latest report data")
             
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Tests for batch position adds and CSV row loading"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import add_position
+
+STATE_PATH = 'state/portfolio_state.json'
+
+INITIAL_STATE = {
+    "positions": {},
+    "cash": 1000.00,
+    "portfolio_value": 1000.00,
+    "last_update": None
+}
+
+class AddPositionsTest(unittest.TestCase):
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        os.makedirs('state')
+        with open(STATE_PATH, 'w') as f:
+            json.dump(INITIAL_STATE, f)
+    
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.tmp_dir)
+    
+    def read_state(self):
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    
+    def run_quietly(self, func, *args, **kwargs):
+        """Call func with stdout captured; return its result and the printed text"""
+        out = io.StringIO()
+        with redirect_stdout(out):
+            result = func(*args, **kwargs)
+        return result, out.getvalue()
+    
+    def test_partial_success_keeps_valid_rows(self):
+        rows = [
+            {'symbol': 'abc', 'shares': '10', 'price': '20'},
+            {'symbol': 'XYZ', 'shares': '10', 'price': '500'}
+        ]
+        
+        results, output = self.run_quietly(add_position.add_positions, rows)
+        
+        self.assertEqual(results, [True, False])
+        self.assertIn('Insufficient cash', output)
+        state = self.read_state()
+        self.assertEqual(list(state['positions']), ['ABC'])
+        self.assertEqual(state['cash'], 800.0)
+        self.assertAlmostEqual(state['positions']['ABC']['stop_level'], 17.4)
+    
+    def test_strict_rejects_whole_batch(self):
+        rows = [
+            {'symbol': 'ABC', 'shares': '10', 'price': '20'},
+            {'symbol': 'XYZ', 'shares': '-5', 'price': '10'}
+        ]
+        
+        with add_position.PortfolioSession() as session:
+            results, output = self.run_quietly(add_position.add_positions, rows, strict=True, state=session.state)
+            session.dirty = any(results)
+        
+        self.assertEqual(results, [False, False])
+        self.assertNotIn('Added position', output)
+        self.assertIn('batch rejected', output)
+        self.assertEqual(session.state, INITIAL_STATE)
+        self.assertEqual(self.read_state(), INITIAL_STATE)
+        self.assertFalse(os.path.exists(f"{STATE_PATH}.tmp"))
+    
+    def test_strict_success_reports_after_commit(self):
+        rows = [
+            {'symbol': 'ABC', 'shares': '10', 'price': '20'},
+            {'symbol': 'DEF', 'shares': '5', 'price': '40'}
+        ]
+        
+        results, output = self.run_quietly(add_position.add_positions, rows, strict=True)
+        
+        self.assertEqual(results, [True, True])
+        self.assertIn('Added position: ABC', output)
+        self.assertIn('Remaining Cash: $800.00', output)
+        self.assertIn('Remaining Cash: $600.00', output)
+        self.assertEqual(sorted(self.read_state()['positions']), ['ABC', 'DEF'])
+    
+    def test_invalid_rows_are_skipped(self):
+        rows = [
+            {'symbol': 'ABC', 'shares': 'ten', 'price': '20'},
+            {'symbol': 'DEF', 'shares': '10', 'price': '0'},
+            {'symbol': 'GHI', 'price': '20'},
+            {'symbol': None, 'shares': '1', 'price': '1'}
+        ]
+        
+        results, output = self.run_quietly(add_position.add_positions, rows)
+        
+        self.assertEqual(results, [False] * 4)
+        self.assertIn('Price must be positive', output)
+        self.assertEqual(output.count('Invalid row'), 3)
+        self.assertEqual(self.read_state(), INITIAL_STATE)
+    
+    def test_blank_symbols_and_non_finite_values_are_rejected(self):
+        rows = [
+            {'symbol': '   ', 'shares': '10', 'price': '20'},
+            {'symbol': '', 'shares': '10', 'price': '20'},
+            {'symbol': 'ABC', 'shares': '10', 'price': 'nan'},
+            {'symbol': 'DEF', 'shares': '10', 'price': 'inf'},
+            {'symbol': 'GHI', 'shares': '10', 'price': '-inf'}
+        ]
+        
+        results, output = self.run_quietly(add_position.add_positions, rows)
+        
+        self.assertEqual(results, [False] * 5)
+        self.assertEqual(output.count('Symbol must not be empty'), 2)
+        self.assertEqual(output.count('Price must be positive'), 3)
+        self.assertEqual(self.read_state(), INITIAL_STATE)
+    
+    def test_validate_position_inputs(self):
+        self.assertIsNone(add_position.validate_position_inputs('ABC', 10, 20.0))
+        self.assertIsNotNone(add_position.validate_position_inputs(' ', 10, 20.0))
+        self.assertIsNotNone(add_position.validate_position_inputs('ABC', float('nan'), 20.0))
+        self.assertIsNotNone(add_position.validate_position_inputs('ABC', 10, float('nan')))
+    
+    def test_load_position_rows_feeds_add_positions(self):
+        with open('positions.csv', 'w', newline='') as f:
+            f.write("symbol,shares,price,catalyst,sector\n")
+            f.write("ABC,10,20,Earnings beat,Tech\n")
+            f.write("DEF,5,40,,\n")
+        
+        rows = add_position.load_position_rows('positions.csv')
+        
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['catalyst'], 'Earnings beat')
+        
+        results, _ = self.run_quietly(add_position.add_positions, rows)
+        
+        self.assertEqual(results, [True, True])
+        positions = self.read_state()['positions']
+        self.assertEqual(positions['ABC']['sector'], 'Tech')
+        self.assertEqual(positions['DEF']['catalyst'], '')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for benchmark history CSV writes and return calculation"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import update_benchmarks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class NumpyStyleFloat(float):
+    """Stand-in for np.float64 under numpy >= 2: a float subclass with a non-numeric repr"""
+    
+    def __repr__(self):
+        return f"np.float64({float(self)!r})"
+
+def make_scalar(value):
+    """A numpy scalar if numpy is installed, else a float subclass that reprs the same way"""
+    return np.float64(value) if np is not None else NumpyStyleFloat(value)
+
+class BenchmarkHistoryRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.original_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        os.makedirs('docs')
+    
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.tmp_dir)
+    
+    def test_numpy_scalar_prices_round_trip(self):
+        os.makedirs('data')
+        with open('data/benchmark_history.csv', 'w') as f:
+            f.write("date,SPY_price\n2025-01-02,500.0\n")
+        
+        update_benchmarks.save_benchmark_history({'SPY': {'price': make_scalar(603.04)}})
+        
+        with open('data/benchmark_history.csv') as f:
+            content = f.read()
+        self.assertNotIn('np.float64', content)
+        self.assertTrue(content.endswith(',603.04\n'))
+        
+        update_benchmarks.calculate_benchmark_returns()
+        
+        with open('docs/benchmark_returns.json') as f:
+            returns = json.load(f)['returns']
+        self.assertEqual(returns['SPY']['start_price'], 500.0)
+        self.assertEqual(returns['SPY']['current_price'], 603.04)
+        self.assertEqual(returns['SPY']['days'], 2)
+    
+    def test_new_file_writes_plain_numbers(self):
+        update_benchmarks.save_benchmark_history({'SPY': {'price': make_scalar(603.04)}})
+        
+        with open('data/benchmark_history.csv') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], 'date,SPY_price')
+        self.assertTrue(lines[1].endswith(',603.04'))
+
+if __name__ == '__main__':
+    unittest.main()
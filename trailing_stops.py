@@ -1,49 +1,21 @@
 #!/usr/bin/env python3
+import os
 import json
-import requests
 from datetime import datetime
-from alpaca_client import get_alpaca_client
+from alpaca_client import load_config, get_alpaca_client, get_positions_cached, get_position_prices, fill_missing_prices, get_stock_thresholds
+from file_cache import FileCache
 
-def load_config():
-    """Load configuration from config.json"""
-    with open('config.json', 'r') as f:
-        return json.load(f)
+# 20-day volatility only moves with each new daily close
+VOLATILITY_CACHE_TTL = 24 * 60 * 60
+volatility_cache = FileCache()
 
-def get_current_price(symbol):
-    """Get current stock price"""
-    import os
-    alpha_vantage_key = os.environ.get('ALPHA_VANTAGE_API_KEY')
-    
-    if alpha_vantage_key:
-        try:
-            url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={alpha_vantage_key}"
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            
-            if "Global Quote" in data:
-                return float(data["Global Quote"]["05. price"])
-        except Exception as e:
-            print(f"Alpha Vantage failed for {symbol}: {e}")
-    
-    # Fallback to Yahoo Finance
-    try:
-        import yfinance as yf
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="1d")
-        if not hist.empty:
-            return float(hist['Close'].iloc[-1])
-    except Exception as e:
-        print(f"YFinance failed for {symbol}: {e}")
-    
-    return None
-
-def calculate_trailing_stop(symbol, current_price, config):
-    """Calculate trailing stop level for a position"""
-    stock_config = config["stocks"][symbol]
+def calculate_trailing_stop(symbol, current_price, config, thresholds=None):
+    """Calculate trailing stop level for a position (thresholds: the symbol's StockThresholds, looked up if omitted)"""
+    thresholds = thresholds or get_stock_thresholds()[symbol]
     portfolio_config = config["portfolio"]
     
-    entry_price = stock_config["entry_target"]
-    base_stop = stock_config["stop_loss"]
+    entry_price = thresholds.entry_target
+    base_stop = thresholds.stop_loss
     trailing_trigger = portfolio_config["trailing_stop_trigger"]
     
     # Calculate gain percentage from entry
@@ -85,7 +57,7 @@ def update_all_trailing_stops():
     
     # Get current positions
     try:
-        alpaca_positions = client.get_all_positions()
+        alpaca_positions = get_positions_cached(client)
         current_positions = {pos.symbol: pos for pos in alpaca_positions if pos.symbol in config["stocks"]}
     except Exception as e:
         print(f"Error getting positions: {e}")
@@ -93,26 +65,38 @@ def update_all_trailing_stops():
     
     trailing_stops = {}
     
+    # Prices come with the positions payload already fetched above; a batched
+    # quote request and then per-symbol lookups (run concurrently) fill any gaps
+    prices = fill_missing_prices(get_position_prices(current_positions), current_positions.keys())
+    
+    # Per-symbol status lines are collected and printed with a single write after the loop
+    lines = []
+    # Look thresholds up once for the pass rather than once per symbol
+    thresholds_by_symbol = get_stock_thresholds()
+    
     for symbol in config["stocks"].keys():
         if symbol not in current_positions:
-            print(f"Position {symbol} not found - skipping")
+            lines.append(f"Position {symbol} not found - skipping")
             continue
         
         # Get current price
-        current_price = get_current_price(symbol)
+        current_price = prices.get(symbol)
         if not current_price:
-            print(f"Could not get price for {symbol} - skipping")
+            lines.append(f"Could not get price for {symbol} - skipping")
             continue
         
         # Calculate trailing stop
-        trailing_data = calculate_trailing_stop(symbol, current_price, config)
+        trailing_data = calculate_trailing_stop(symbol, current_price, config, thresholds_by_symbol[symbol])
         trailing_stops[symbol] = trailing_data
         
         # Display results
         if trailing_data["trailing_active"]:
-            print(f"{symbol}: ${current_price:.2f} | Trailing Stop: ${trailing_data['trailing_stop']:.2f} | Gain: {trailing_data['gain_pct']:.2%} ✅")
+            lines.append(f"{symbol}: ${current_price:.2f} | Trailing Stop: ${trailing_data['trailing_stop']:.2f} | Gain: {trailing_data['gain_pct']:.2%} ✅")
         else:
-            print(f"{symbol}: ${current_price:.2f} | Base Stop: ${trailing_data['base_stop']:.2f} | Gain: {trailing_data['gain_pct']:.2%}")
+            lines.append(f"{symbol}: ${current_price:.2f} | Base Stop: ${trailing_data['base_stop']:.2f} | Gain: {trailing_data['gain_pct']:.2%}")
+    
+    if lines:
+        print("\n".join(lines))
     
     return {
         "status": "update_complete",
@@ -131,6 +115,7 @@ def check_trailing_stop_triggers():
     print("\n=== Checking Trailing Stop Triggers ===")
     
     triggers = []
+    checked_at = datetime.now().isoformat()
     
     for symbol, trailing_data in update_result["trailing_stops"].items():
         current_price = trailing_data["current_price"]
@@ -145,7 +130,7 @@ def check_trailing_stop_triggers():
                 "stop_level": trailing_stop,
                 "trigger_reason": f"Price ${current_price:.2f} <= Stop ${trailing_stop:.2f}",
                 "gain_preserved": trailing_data["gain_pct"],
-                "timestamp": datetime.now().isoformat()
+                "timestamp": checked_at
             }
             
             triggers.append(trigger_info)
@@ -156,7 +141,7 @@ def check_trailing_stop_triggers():
         "trailing_stops": update_result["trailing_stops"],
         "triggers": triggers,
         "triggers_count": len(triggers),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": checked_at
     }
 
 def optimize_trailing_stops():
@@ -166,19 +151,26 @@ def optimize_trailing_stops():
     print("=== Optimizing Trailing Stops ===")
     
     optimizations = {}
+    today = datetime.now().date().isoformat()
     
     for symbol in config["stocks"].keys():
-        # Get historical volatility data
+        # Get historical volatility data, at most once per symbol per day
         try:
-            import yfinance as yf
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="20d")  # 20-day history
+            cache_key = f"volatility_{symbol}_{today}"
+            volatility = volatility_cache.get(cache_key, VOLATILITY_CACHE_TTL)
             
-            if len(hist) >= 10:
-                # Calculate volatility metrics
-                returns = hist['Close'].pct_change().dropna()
-                volatility = returns.std() * (252 ** 0.5)  # Annualized volatility
+            if volatility is None:
+                import yfinance as yf
+                ticker = yf.Ticker(symbol)
+                hist = ticker.history(period="20d")  # 20-day history
                 
+                if len(hist) >= 10:
+                    # Calculate volatility metrics
+                    returns = hist['Close'].pct_change().dropna()
+                    volatility = float(returns.std() * (252 ** 0.5))  # Annualized volatility
+                    volatility_cache.set(cache_key, volatility)
+            
+            if volatility is not None:
                 # Calculate optimal trailing distance based on volatility
                 base_distance = 0.08  # 8% base trailing distance
                 
@@ -237,16 +229,24 @@ def generate_trailing_stops_report():
     
     return report
 
+def write_json_atomic(path, data):
+    """Encode data once and write it via a temp file renamed over path, so readers never see a partial file"""
+    payload = json.dumps(data, indent=2).encode('utf-8')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
 def save_trailing_stops_state(trailing_stops_data):
     """Save current trailing stops state to file"""
+    now_iso = datetime.now().isoformat()
     state = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso,
         "trailing_stops": trailing_stops_data,
-        "last_update": datetime.now().isoformat()
+        "last_update": now_iso
     }
     
-    with open('data/trailing_stops_state.json', 'w') as f:
-        json.dump(state, f, indent=2)
+    write_json_atomic('data/trailing_stops_state.json', state)
     
     print("Trailing stops state saved to data/trailing_stops_state.json")
 
@@ -291,6 +291,5 @@ if __name__ == "__main__":
         save_trailing_stops_state(report["trailing_stops_check"]["trailing_stops"])
     
     # Save report
-    with open('data/trailing_stops_report.json', 'w') as f:
-        json.dump(report, f, indent=2)
+    write_json_atomic('data/trailing_stops_report.json', report)
     print(f"\nReport saved to data/trailing_stops_report.json")
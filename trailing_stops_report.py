@@ -6,9 +6,9 @@ Generates comprehensive stop-loss analysis and saves reports
 
 import json
 import os
-import pandas as pd
 from datetime import datetime, timedelta
 import logging
+from report_json import json_default
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,10 +26,12 @@ class TrailingStopsReporter:
     
     def load_portfolio_state(self):
         """Load current portfolio state"""
-        if os.path.exists(self.portfolio_state_file):
-            with open(self.portfolio_state_file, 'r') as f:
-                return json.load(f)
-        return {"positions": {}}
+        # One read of the whole file, then parse from memory (as add_position.py does)
+        try:
+            with open(self.portfolio_state_file, 'rb') as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return {"positions": {}}
     
     def calculate_stop_metrics(self, positions):
         """Calculate stop-loss related metrics"""
@@ -97,6 +99,8 @@ class TrailingStopsReporter:
             return {}
         
         try:
+            # pandas is only needed once there is stop history to analyze
+            import pandas as pd
             df = pd.read_csv(self.stop_history_file)
             
             if df.empty:
@@ -196,28 +200,48 @@ class TrailingStopsReporter:
         
         return alerts
     
+    @staticmethod
+    def _report_content(report_data):
+        """Canonical encoding of a report minus its timestamp, for change detection"""
+        content = {key: value for key, value in report_data.items() if key != 'timestamp'}
+        return json.dumps(content, sort_keys=True, default=json_default)
+    
     def save_report_json(self, report_data):
-        """Save comprehensive report as JSON"""
+        """Save comprehensive report as JSON, skipping the write if nothing but the timestamp changed"""
         report_file = 'docs/trailing_stops_report.json'
         
         try:
-            with open(report_file, 'w') as f:
-                json.dump(report_data, f, indent=2, default=str)
+            # Weekends and closed-market runs reproduce the previous report exactly;
+            # leave that file (and its timestamp) alone instead of rewriting it
+            try:
+                with open(report_file, 'rb') as f:
+                    previous = json.loads(f.read())
+                if self._report_content(previous) == self._report_content(report_data):
+                    logger.info(f"Trailing stops report unchanged, kept {report_file}")
+                    return
+            except (FileNotFoundError, ValueError):
+                pass
+            
+            # Encode in one pass and write once, as the other report writers do
+            payload = json.dumps(report_data, indent=2, default=json_default).encode('utf-8')
+            with open(report_file, 'wb') as f:
+                f.write(payload)
             
             logger.info(f"Saved trailing stops report to {report_file}")
             
         except Exception as e:
             logger.error(f"Error saving JSON report: {e}")
     
-    def save_report_markdown(self, report_data):
+    def save_report_markdown(self, report_data, now=None):
         """Save report as Markdown"""
-        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        now = now or datetime.now()
+        timestamp = now.strftime('%Y-%m-%d_%H-%M-%S')
         report_file = f'{self.reports_dir}/trailing_stops_report_{timestamp}.md'
         
         try:
             with open(report_file, 'w') as f:
                 f.write("# Trailing Stop-Loss Report\n\n")
-                f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+                f.write(f"**Generated:** {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
                 
                 # Portfolio metrics
                 metrics = report_data.get('portfolio_metrics', {})
@@ -267,6 +291,9 @@ class TrailingStopsReporter:
         """Generate comprehensive trailing stops report"""
         logger.info("Generating trailing stops report...")
         
+        # One clock read per run so the JSON timestamp and Markdown file name agree
+        now = datetime.now()
+        
         # Load data
         portfolio_state = self.load_portfolio_state()
         positions = portfolio_state.get('positions', {})
@@ -274,7 +301,7 @@ class TrailingStopsReporter:
         if not positions:
             logger.info("No positions found, generating empty report")
             report_data = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now.isoformat(),
                 'portfolio_metrics': {},
                 'position_analysis': {},
                 'alerts': [],
@@ -289,7 +316,7 @@ class TrailingStopsReporter:
             
             # Compile report
             report_data = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now.isoformat(),
                 'portfolio_metrics': portfolio_metrics,
                 'position_analysis': position_analysis,
                 'alerts': alerts,
@@ -298,7 +325,7 @@ class TrailingStopsReporter:
         
         # Save reports
         self.save_report_json(report_data)
-        self.save_report_markdown(report_data)
+        self.save_report_markdown(report_data, now)
         
         # Print summary
         self.print_summary(report_data)
@@ -4,8 +4,8 @@ Benchmark Data Updater for Mid-Cap Experiment
 Updates benchmark prices (MDY, SPY, IWM, QQQ) and saves to CSV
 """
 
-import yfinance as yf
-import pandas as pd
+import csv
+import io
 import os
 from datetime import datetime, timedelta
 import logging
@@ -16,6 +16,9 @@ logger = logging.getLogger(__name__)
 
 def get_benchmark_data():
     """Fetch current benchmark prices"""
+    # Imported here so history/returns helpers don't pay yfinance's (pandas) import cost
+    import yfinance as yf
+    
     benchmarks = {
         'MDY': 'SPDR S&P MidCap 400 ETF',
         'SPY': 'SPDR S&P 500 ETF',
@@ -25,17 +28,34 @@ def get_benchmark_data():
     
     benchmark_data = {}
     
+    # One multi-ticker download (fetched in parallel by yfinance) instead of a request per symbol
+    try:
+        hist_all = yf.download(
+            tickers=list(benchmarks),
+            period='1d',
+            group_by='ticker',
+            threads=True,
+            progress=False
+        )
+    except Exception as e:
+        logger.error(f"Error fetching benchmarks: {e}")
+        return benchmark_data
+    
+    # Every benchmark comes from the same download; stamp them once
+    fetched_at = datetime.now().isoformat()
+    
     for symbol, name in benchmarks.items():
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period='1d')
+            closes = hist_all[symbol]['Close'].dropna()
             
-            if not hist.empty:
-                current_price = hist['Close'].iloc[-1]
+            if not closes.empty:
+                # Plain float, not np.float64: csv writes float subclasses with repr(),
+                # which numpy >= 2 renders as 'np.float64(...)'
+                current_price = float(closes.iloc[-1])
                 benchmark_data[symbol] = {
                     'price': round(current_price, 2),
                     'name': name,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': fetched_at
                 }
                 logger.info(f"Retrieved {symbol}: ${current_price:.2f}")
             else:
@@ -46,8 +66,33 @@ def get_benchmark_data():
     
     return benchmark_data
 
+def _format_csv_row(fieldnames, row_data):
+    """Render one CSV row (pandas-style '\n' line ending) as bytes"""
+    buffer = io.StringIO()
+    csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator='\n').writerow(row_data)
+    return buffer.getvalue().encode('utf-8')
+
+def _rewrite_benchmark_history(csv_file, row_data):
+    """Rewrite the whole history when today's row brings a column the file lacks"""
+    with open(csv_file, newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames)
+        rows = [row for row in reader if row['date'] != row_data['date']]
+    
+    fieldnames += [field for field in row_data if field not in fieldnames]
+    rows.append(row_data)
+    
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
 def save_benchmark_history(benchmark_data):
-    """Save benchmark data to CSV history"""
+    """Save benchmark data to CSV history
+    
+    Appends today's row, or rewrites just the last line if today is already
+    there, so the existing history is never re-read or rewritten.
+    """
     if not benchmark_data:
         logger.error("No benchmark data to save")
         return
@@ -56,41 +101,54 @@ def save_benchmark_history(benchmark_data):
     os.makedirs('data', exist_ok=True)
     
     # Prepare row for CSV
-    today = datetime.now().date()
+    today = datetime.now().date().isoformat()
     row_data = {'date': today}
     
+    # float() so numpy scalars are written as numbers, not their repr()
     for symbol, data in benchmark_data.items():
-        row_data[f'{symbol}_price'] = data['price']
-    
-    # Create DataFrame
-    df_new = pd.DataFrame([row_data])
+        row_data[f'{symbol}_price'] = float(data['price'])
     
     # File path
     csv_file = 'data/benchmark_history.csv'
     
     try:
-        if os.path.exists(csv_file):
-            # Read existing data
-            df_existing = pd.read_csv(csv_file)
-            df_existing['date'] = pd.to_datetime(df_existing['date']).dt.date
-            
-            # Check if today's data already exists
-            if today in df_existing['date'].values:
-                # Update today's row
-                df_existing.loc[df_existing['date'] == today] = row_data
-                df_combined = df_existing
-                logger.info("Updated existing benchmark data for today")
-            else:
-                # Append new row
-                df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-                logger.info("Added new benchmark data row")
-        else:
+        if not os.path.exists(csv_file) or os.path.getsize(csv_file) == 0:
             # Create new file
-            df_combined = df_new
+            with open(csv_file, 'wb') as f:
+                f.write((','.join(row_data) + '\n').encode('utf-8'))
+                f.write(_format_csv_row(list(row_data), row_data))
             logger.info("Created new benchmark history file")
+        else:
+            with open(csv_file, 'r+b') as f:
+                fieldnames = next(csv.reader([f.readline().decode('utf-8')]))
+                
+                # Only the tail is needed to find the last row
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - 4096))
+                tail = f.read()
+                last_start = tail.rstrip(b'\n').rfind(b'\n') + 1
+                last_line = tail[last_start:].decode('utf-8')
+                
+                if set(row_data) - set(fieldnames):
+                    action = None
+                elif last_line.split(',', 1)[0] == today:
+                    # Update today's row
+                    f.seek(size - len(tail) + last_start)
+                    f.truncate()
+                    f.write(_format_csv_row(fieldnames, row_data))
+                    action = "Updated existing benchmark data for today"
+                else:
+                    # Append new row
+                    if not tail.endswith(b'\n'):
+                        f.write(b'\n')
+                    f.write(_format_csv_row(fieldnames, row_data))
+                    action = "Added new benchmark data row"
+            
+            if action is None:
+                _rewrite_benchmark_history(csv_file, row_data)
+                action = "Rewrote benchmark history with new columns"
+            logger.info(action)
         
-        # Save to CSV
-        df_combined.to_csv(csv_file, index=False)
         logger.info(f"Saved benchmark data to {csv_file}")
         
     except Exception as e:
@@ -129,31 +187,33 @@ def calculate_benchmark_returns():
         return
     
     try:
-        df = pd.read_csv(csv_file)
+        with open(csv_file, newline='') as f:
+            reader = csv.DictReader(f)
+            price_columns = [col for col in reader.fieldnames if col.endswith('_price')]
+            rows = list(reader)
         
-        if len(df) < 2:
+        if len(rows) < 2:
             logger.info("Not enough data for return calculations")
             return
         
         # Calculate returns for each benchmark
         returns_data = {}
         
-        for col in df.columns:
-            if col.endswith('_price'):
-                symbol = col.replace('_price', '')
-                prices = df[col].dropna()
+        for col in price_columns:
+            symbol = col.replace('_price', '')
+            prices = [float(row[col]) for row in rows if row.get(col)]
+            
+            if len(prices) >= 2:
+                current_price = prices[-1]
+                start_price = prices[0]
+                total_return = (current_price - start_price) / start_price
                 
-                if len(prices) >= 2:
-                    current_price = prices.iloc[-1]
-                    start_price = prices.iloc[0]
-                    total_return = (current_price - start_price) / start_price
-                    
-                    returns_data[symbol] = {
-                        'start_price': round(start_price, 2),
-                        'current_price': round(current_price, 2),
-                        'total_return': round(total_return * 100, 2),
-                        'days': len(prices)
-                    }
+                returns_data[symbol] = {
+                    'start_price': round(start_price, 2),
+                    'current_price': round(current_price, 2),
+                    'total_return': round(total_return * 100, 2),
+                    'days': len(prices)
+                }
         
         # Save returns data
         if returns_data: